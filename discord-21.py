@@ -3,13 +3,22 @@ from discord.ext import commands
 import random
 import asyncio
 import os
+import io
 import logging
 import json
 import time
-from typing import Optional, Dict, Any, Tuple, Union
-from dataclasses import dataclass
+import itertools
+import functools
+import weakref
+from typing import Optional, Dict, Any, Tuple, Union, Callable
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ==================== CONFIGURATION ====================
 
 # Logging setup
@@ -23,29 +32,31 @@ logger = logging.getLogger(__name__)
 def setup_environment():
     """Setup environment variables with proper error handling"""
     try:
-        from dotenv import load_dotenv, dotenv_values
+        from dotenv import load_dotenv, find_dotenv
         
-        # Try different encodings for .env file
-        encodings = ['utf-8', 'utf-8-sig', 'latin-1']
-        for encoding in encodings:
-            try:
-                load_dotenv(encoding=encoding)
-                if os.getenv('DISCORD_TOKEN'):
-                    break
-                    
-                # Fallback manual loading
-                env_vars = dotenv_values('.env')
-                for key, value in env_vars.items():
-                    clean_key = key.lstrip('\ufeff')
-                    os.environ[clean_key] = value
-                    
-            except UnicodeDecodeError:
-                continue
+        # Prefer the .env next to this script, then fall back to the working directory
+        env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+        if not os.path.isfile(env_path):
+            env_path = find_dotenv(usecwd=True)
+        if not env_path:
+            return
+        
+        # Read .env once, strip a UTF-8 BOM and only fall back to latin-1 if needed
+        with open(env_path, 'rb') as f:
+            raw = f.read()
+        if raw.startswith(b'\xef\xbb\xbf'):
+            raw = raw[3:]
+        try:
+            text = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            text = raw.decode('latin-1')
+        
+        load_dotenv(stream=io.StringIO(text))
                 
     except ImportError:
         logger.warning("python-dotenv not installed. Using system environment variables.")
     except Exception as e:
-        logger.error(f"Environment setup error: {e}")
+        logger.error("Environment setup error: %s", e)
 
 setup_environment()
 
@@ -57,10 +68,15 @@ class Config:
     GAME_TIMEOUT: int = int(os.getenv('GAME_TIMEOUT', 60))
     MAX_CARD_VALUE: int = int(os.getenv('MAX_CARD_VALUE', 11))
     STATS_FILE: str = "game_stats.json"
+    STATS_SAVE_INTERVAL: int = int(os.getenv('STATS_SAVE_INTERVAL', 30))
     BOT_PREFIX: str = "#"
+    ENABLE_PREFIX_COMMANDS: bool = os.getenv('ENABLE_PREFIX_COMMANDS', '0') == '1'
 
 config = Config()
 
+# Full deck, shuffled into a fresh list for every game
+_DECK_TEMPLATE = tuple(range(1, config.MAX_CARD_VALUE + 1))
+
 # ==================== ENUMS & DATA CLASSES ====================
 
 class GameEndReason(Enum):
@@ -74,16 +90,56 @@ class GameStatus(Enum):
     READY = "✅ Ready"
     BUST = "💥 BUST"
 
-@dataclass
+@dataclass(slots=True)
 class PlayerData:
     """Clean player data structure"""
     user: discord.Member
     cards: list[int]
     continued: bool = False
+    mention: str = field(default="", init=False, repr=False)
+    name: str = field(default="", init=False, repr=False)
+    avatar_url: str = field(default="", init=False, repr=False)
+    _total: int = field(default=0, init=False, repr=False)
+    _cards_text: str = field(default="", init=False, repr=False)
+    _visible_text: str = field(default="", init=False, repr=False)
+    
+    def __post_init__(self):
+        # Names don't change during a game, resolve them once
+        self.mention = self.user.mention
+        self.name = self.user.display_name
+        self.avatar_url = self.user.display_avatar.url
+        self._total = sum(self.cards)
+        self._cards_text = " • ".join(f"**{card}**" for card in self.cards)
+        self._visible_text = " • ".join(
+            f"**{card}**" for card in itertools.islice(self.cards, 1, None)
+        )
+    
+    def add_card(self, card: int) -> None:
+        """Add card to hand and keep running total and display strings"""
+        card_text = f"**{card}**"
+        if self.cards:  # First card stays hidden
+            self._visible_text = self._join_card_text(self._visible_text, card_text)
+        self._cards_text = self._join_card_text(self._cards_text, card_text)
+        self.cards.append(card)
+        self._total += card
+    
+    @staticmethod
+    def _join_card_text(text: str, card_text: str) -> str:
+        return f"{text} • {card_text}" if text else card_text
     
     @property
     def total(self) -> int:
-        return sum(self.cards)
+        return self._total
+    
+    @property
+    def cards_text(self) -> str:
+        """All cards, formatted for embeds"""
+        return self._cards_text
+    
+    @property
+    def visible_text(self) -> str:
+        """Cards visible to the opponent (all but the first)"""
+        return self._visible_text
     
     @property
     def is_bust(self) -> bool:
@@ -102,13 +158,18 @@ class StatsManager:
         self.stats_file = stats_file
         self._cache: Dict[str, Dict[str, int]] = {}
         self._cache_dirty = False
+        self._autosave_task: Optional[asyncio.Task] = None
         self.load_stats()
     
     def load_stats(self) -> None:
         """Load stats from file with caching"""
         try:
-            with open(self.stats_file, 'r') as f:
-                self._cache = json.load(f)
+            if orjson:
+                with open(self.stats_file, 'rb') as f:
+                    self._cache = orjson.loads(f.read())
+            else:
+                with open(self.stats_file, 'r') as f:
+                    self._cache = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             self._cache = {}
         self._cache_dirty = False
@@ -117,13 +178,49 @@ class StatsManager:
         """Save stats only if cache is dirty"""
         if not self._cache_dirty:
             return
-            
-        try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(self._cache, f, indent=2)
+        
+        if self._write_stats(self._cache):
             self._cache_dirty = False
+    
+    async def save_stats_async(self) -> None:
+        """Save stats from a worker thread, only if cache is dirty"""
+        if not self._cache_dirty:
+            return
+        
+        # Snapshot on the loop so updates made during the write stay dirty
+        data = {key: dict(value) for key, value in self._cache.items()}
+        self._cache_dirty = False
+        if not await asyncio.to_thread(self._write_stats, data):
+            self._cache_dirty = True
+    
+    def start_autosave(self, interval: float) -> None:
+        """Start background task that periodically flushes dirty stats"""
+        if self._autosave_task and not self._autosave_task.done():
+            return
+        self._autosave_task = asyncio.create_task(self._autosave(interval))
+    
+    async def _autosave(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.save_stats_async()
+    
+    def _write_stats(self, data: Dict[str, Dict[str, int]]) -> bool:
+        """Write stats to disk atomically, returning whether it succeeded"""
+        tmp_file = f"{self.stats_file}.tmp"
+        try:
+            if orjson:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+            
+            # Swap in the new file so a crash mid-write can't truncate stats
+            os.replace(tmp_file, self.stats_file)
+            return True
         except Exception as e:
-            logger.error(f"Failed to save stats: {e}")
+            logger.error("Failed to save stats: %s", e)
+            return False
     
     def get_user_stats(self, user_id: int) -> Dict[str, int]:
         """Get user statistics"""
@@ -131,20 +228,16 @@ class StatsManager:
     
     def update_game_result(self, winner_id: int, loser_id: int) -> None:
         """Update game statistics"""
-        winner_key, loser_key = str(winner_id), str(loser_id)
-        
         # Initialize if not exists
-        if winner_key not in self._cache:
-            self._cache[winner_key] = {'wins': 0, 'losses': 0}
-        if loser_key not in self._cache:
-            self._cache[loser_key] = {'wins': 0, 'losses': 0}
+        winner_stats = self._cache.setdefault(str(winner_id), {'wins': 0, 'losses': 0})
+        loser_stats = self._cache.setdefault(str(loser_id), {'wins': 0, 'losses': 0})
         
         # Update stats
-        self._cache[winner_key]['wins'] += 1
-        self._cache[loser_key]['losses'] += 1
+        winner_stats['wins'] += 1
+        loser_stats['losses'] += 1
         self._cache_dirty = True
         
-        logger.info(f"Stats updated: Winner {winner_id}, Loser {loser_id}")
+        logger.info("Stats updated: Winner %s, Loser %s", winner_id, loser_id)
 
 # Global stats manager
 stats_manager = StatsManager(config.STATS_FILE)
@@ -154,68 +247,125 @@ stats_manager = StatsManager(config.STATS_FILE)
 class GameState:
     """Enhanced game state with better resource management"""
     
+    __slots__ = (
+        'key', 'player1', 'player2', 'p1_id', 'p2_id', 'channel', 'deck', '_deck_index',
+        'current_player', 'opponent', 'current_turn_id', 'turn_start_time', '_timeout_handle', '_timeout_callback',
+        'public_message', 'view', 'embed', 'last_public_signature', 'public_update_pending',
+        '_tasks', '__weakref__',
+    )
+    
     def __init__(self, player1: discord.Member, player2: discord.Member, channel: discord.TextChannel):
-        self.player1 = PlayerData(player1, [])
-        self.player2 = PlayerData(player2, [])
+        self.key = make_game_key(player1.id, player2.id)
         self.channel = channel
         
         # Initialize deck and deal cards
-        self.deck = list(range(1, config.MAX_CARD_VALUE + 1))
-        random.shuffle(self.deck)
-        self.player1.cards = [self.deck.pop()]
-        self.player2.cards = [self.deck.pop()]
+        self.deck = random.sample(_DECK_TEMPLATE, len(_DECK_TEMPLATE))
+        self._deck_index = 0
+        self.player1 = PlayerData(player1, [self.draw_card()])
+        self.player2 = PlayerData(player2, [self.draw_card()])
+        
+        self.p1_id, self.p2_id = player1.id, player2.id
         
         # Game state
+        self.current_player = self.player1
+        self.opponent = self.player2
         self.current_turn_id = player1.id
         self.turn_start_time = time.time()
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
+        self._timeout_callback: Optional[Callable[[], Any]] = None
         self.public_message: Optional[discord.Message] = None
+        self.view: Optional[discord.ui.View] = None
+        self.embed: Optional[discord.Embed] = None
+        self.last_public_signature: Optional[tuple] = None
+        self.public_update_pending = False
         
         # Tasks for cleanup
-        self._tasks: list[asyncio.Task] = []
+        self._tasks: set[asyncio.Task] = set()
+    
+    def draw_card(self) -> int:
+        """Draw next card from the deck"""
+        card = self.deck[self._deck_index]
+        self._deck_index += 1
+        return card
+    
+    @property
+    def deck_empty(self) -> bool:
+        """Check if all cards have been drawn"""
+        return self._deck_index >= len(self.deck)
     
     def get_player_data(self, user_id: int) -> Optional[PlayerData]:
         """Get player data by user ID"""
-        if self.player1.user.id == user_id:
+        if self.p1_id == user_id:
             return self.player1
-        elif self.player2.user.id == user_id:
+        elif self.p2_id == user_id:
             return self.player2
         return None
     
     def get_opponent_data(self, user_id: int) -> Optional[PlayerData]:
         """Get opponent data by user ID"""
-        if self.player1.user.id == user_id:
+        if self.p1_id == user_id:
             return self.player2
-        elif self.player2.user.id == user_id:
+        elif self.p2_id == user_id:
             return self.player1
         return None
     
-    def get_current_player(self) -> PlayerData:
-        """Get current turn player"""
-        return self.get_player_data(self.current_turn_id)
-    
     def reset_turn_timer(self) -> None:
         """Reset turn timer to full duration"""
         self.turn_start_time = time.time()
+        self._arm_timeout()
+    
+    def set_timeout_callback(self, callback: Callable[[], Any]) -> None:
+        """Register callback fired when a turn runs out and arm it for this turn"""
+        self._timeout_callback = callback
+        self._arm_timeout()
+    
+    def _arm_timeout(self) -> None:
+        """(Re)schedule the timeout callback for the current turn"""
+        if self._timeout_handle:
+            self._timeout_handle.cancel()
+        if self._timeout_callback:
+            self._timeout_handle = asyncio.get_running_loop().call_later(
+                self.remaining_time, self._timeout_callback
+            )
     
     def switch_turn(self) -> None:
         """Switch to next player's turn with full timer reset"""
-        self.current_turn_id = (
-            self.player2.user.id 
-            if self.current_turn_id == self.player1.user.id 
-            else self.player1.user.id
-        )
+        self.current_player, self.opponent = self.opponent, self.current_player
+        self.current_turn_id = self.p2_id if self.current_turn_id == self.p1_id else self.p1_id
         self.reset_turn_timer()  # Always reset to full time on turn switch
     
     def add_task(self, task: asyncio.Task) -> None:
-        """Add task for cleanup tracking"""
-        self._tasks.append(task)
-    
-    def cleanup(self) -> None:
-        """Clean up all resources"""
-        for task in self._tasks:
-            if not task.done():
-                task.cancel()
+        """Add task for cleanup tracking, dropping it once finished"""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def spawn(self, coro) -> asyncio.Task:
+        """Start a background task tied to this game"""
+        task = asyncio.create_task(coro)
+        self.add_task(task)
+        return task
+    
+    async def cleanup(self) -> None:
+        """Clean up all resources and wait for cancelled tasks to finish"""
+        if self._timeout_handle:
+            self._timeout_handle.cancel()
+        self._timeout_handle = None
+        self._timeout_callback = None
+        
+        # Drop the board's view from the bot's view store
+        if self.view:
+            self.view.stop()
+            self.view = None
+        
+        # The timeout task ends the game itself; don't cancel it mid-cleanup
+        current = asyncio.current_task()
+        pending = [task for task in self._tasks if task is not current and not task.done()]
+        for task in pending:
+            task.cancel()
         self._tasks.clear()
+        
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
     
     @property
     def remaining_time(self) -> float:
@@ -223,19 +373,39 @@ class GameState:
         elapsed = time.time() - self.turn_start_time
         return max(0, config.GAME_TIMEOUT - elapsed)
     
+    def public_signature(self) -> tuple:
+        """Snapshot of everything the public embed displays"""
+        return (
+            tuple(self.player1.cards[1:]),
+            tuple(self.player2.cards[1:]),
+            self.player1.continued,
+            self.player2.continued,
+            self.current_turn_id,
+            self.turn_start_time,
+        )
+    
     @property
     def both_continued(self) -> bool:
         """Check if both players have continued"""
         return self.player1.continued and self.player2.continued
 
 # Game storage
-active_games: Dict[frozenset, GameState] = {}
+GameKey = Tuple[int, int]
+
+def make_game_key(player1_id: int, player2_id: int) -> GameKey:
+    """Order-independent key for a pair of players"""
+    return (player1_id, player2_id) if player1_id < player2_id else (player2_id, player1_id)
+
+# active_games owns the games; lookup indexes only hold weak references
+active_games: Dict[GameKey, GameState] = {}
+player_to_game: weakref.WeakValueDictionary[int, GameState] = weakref.WeakValueDictionary()
+message_to_game: weakref.WeakValueDictionary[int, GameState] = weakref.WeakValueDictionary()
 
 # ==================== ERROR HANDLING UTILITY ====================
 
 async def handle_command_error(interaction: discord.Interaction, error: Exception, command_name: str):
     """Centralized error handling for commands"""
-    logger.error(f"Error in {command_name}: {error}")
+    logger.error("Error in %s: %s", command_name, error)
     try:
         if not interaction.response.is_done():
             await interaction.response.send_message(
@@ -247,21 +417,50 @@ async def handle_command_error(interaction: discord.Interaction, error: Exceptio
                 "❌ An error occurred. Please try again.", 
                 ephemeral=True
             )
-    except:
+    except discord.HTTPException:
+        # Interaction expired or was already answered; nothing left to tell the user
         pass
 
 # ==================== EMBED CREATORS ====================
 
+# Shared embed colors
+_COLOR_RED = discord.Color.red()
+_COLOR_GREEN = discord.Color.green()
+_COLOR_GOLD = discord.Color.gold()
+_COLOR_BLUE = discord.Color.blue()
+_COLOR_PURPLE = discord.Color.purple()
+
 class EmbedCreator:
     """Centralized embed creation with consistent styling"""
     
+    _help_embed: Optional[discord.Embed] = None
+    _help_embed_dict: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def get_help_embed(cls) -> discord.Embed:
+        """Get the shared help embed (callers must not mutate it)"""
+        if cls._help_embed is None:
+            cls._help_embed = cls._build_help_embed()
+            cls._help_embed_dict = cls._help_embed.to_dict()
+        return cls._help_embed
+    
+    @classmethod
+    def create_help_embed(cls) -> discord.Embed:
+        """Create an editable copy of the help embed from the cached payload"""
+        cls.get_help_embed()
+        
+        # Fresh fields list so callers can add_field without touching the cache
+        data = dict(cls._help_embed_dict)
+        data['fields'] = list(data['fields'])
+        return discord.Embed.from_dict(data)
+    
     @staticmethod
-    def create_help_embed() -> discord.Embed:
-        """Create help embed"""
+    def _build_help_embed() -> discord.Embed:
+        """Build help embed from scratch"""
         embed = discord.Embed(
             title="🎲 Twenty One Bot - Help",
             description="A card game where you try to get as close to 21 as possible without going over!",
-            color=discord.Color.blue()
+            color=_COLOR_BLUE
         )
         
         fields = [
@@ -284,81 +483,108 @@ class EmbedCreator:
         embed.set_footer(text="All game interactions are private to you!")
         return embed
     
-    @staticmethod
-    def create_private_hand_embed(player_data: PlayerData) -> discord.Embed:
+    _HAND_EMBED_BASE: Dict[str, Any] = {
+        "title": "🃏 Your Hand 🃏",
+        "footer": {"text": "Only you can see this message."},
+    }
+    
+    @classmethod
+    def create_private_hand_embed(cls, player_data: PlayerData) -> discord.Embed:
         """Create private hand embed for player"""
-        color = discord.Color.red() if player_data.is_bust else discord.Color.green()
-        embed = discord.Embed(title="🃏 Your Hand 🃏", color=color)
-        
-        cards_display = " • ".join([f"**{card}**" for card in player_data.cards])
-        embed.add_field(name="Cards", value=cards_display, inline=False)
-        
         total_text = f"**{player_data.total}**"
         if player_data.is_bust:
             total_text += " - BUST! 💥"
-        embed.add_field(name="Total", value=total_text, inline=False)
+        
+        fields = [
+            {"name": "Cards", "value": player_data.cards_text, "inline": False},
+            {"name": "Total", "value": total_text, "inline": False},
+        ]
         
         if not player_data.is_bust:
             if player_data.total == 21:
-                embed.add_field(name="Status", value="🎯 **PERFECT 21!**", inline=False)
+                fields.append({"name": "Status", "value": "🎯 **PERFECT 21!**", "inline": False})
             elif player_data.total > 18:
-                embed.add_field(name="Status", value="⚠️ Getting risky...", inline=False)
+                fields.append({"name": "Status", "value": "⚠️ Getting risky...", "inline": False})
         
-        embed.set_footer(text="Only you can see this message.")
-        return embed
+        # Build from a payload dict in one go rather than field by field
+        data = dict(cls._HAND_EMBED_BASE)
+        data["color"] = (_COLOR_RED if player_data.is_bust else _COLOR_GREEN).value
+        data["fields"] = fields
+        return discord.Embed.from_dict(data)
     
     @staticmethod
     def create_game_embed(game_state: GameState) -> discord.Embed:
-        """Create public game embed"""
+        """Update the game's public embed in place and return it"""
         p1, p2 = game_state.player1, game_state.player2
-        current_player = game_state.get_current_player()
+        current_player = game_state.current_player
         
-        embed = discord.Embed(
-            title="🎲 Twenty One Battle",
-            description=f"⚔️ {p1.user.mention} **VS** {p2.user.mention}",
-            color=discord.Color.gold()
-        )
+        if game_state.embed is None:
+            game_state.embed = EmbedCreator._build_game_embed(game_state)
+        embed = game_state.embed
         
         # Show visible cards (first card hidden, rest visible)
         def get_card_display(player_data: PlayerData) -> str:
-            visible_cards = [f'**{card}**' for card in player_data.cards[1:]]
-            visible_text = ' • '.join(visible_cards)
+            visible_text = player_data.visible_text
             return f"**[?]**{' • ' + visible_text if visible_text else ''}"
         
-        embed.add_field(
-            name=f"🎴 {p1.user.display_name}'s Cards", 
+        embed.set_field_at(
+            0,
+            name=f"🎴 {p1.name}'s Cards", 
             value=get_card_display(p1), 
             inline=True
         )
-        embed.add_field(
-            name=f"🎴 {p2.user.display_name}'s Cards", 
+        embed.set_field_at(
+            1,
+            name=f"🎴 {p2.name}'s Cards", 
             value=get_card_display(p2), 
             inline=True
         )
-        embed.add_field(name="\u200b", value="\u200b", inline=True)
         
         # Player status
         p1_status = GameStatus.READY.value if p1.continued else GameStatus.THINKING.value
         p2_status = GameStatus.READY.value if p2.continued else GameStatus.THINKING.value
         
-        embed.add_field(
+        embed.set_field_at(
+            3,
             name="📊 Status",
-            value=f"{p1.user.mention}: {p1_status}\n{p2.user.mention}: {p2_status}",
+            value=f"{p1.mention}: {p1_status}\n{p2.mention}: {p2_status}",
             inline=False
         )
         
-        # Timer display
-        remaining_time = game_state.remaining_time
-        minutes = int(remaining_time // 60)
-        seconds = int(remaining_time % 60)
-        timer_icon = "🔴" if remaining_time <= 15 else "⏰"
+        # Timer display (relative timestamp, Discord counts down client-side)
+        expiry = int(game_state.turn_start_time + config.GAME_TIMEOUT)
         
-        embed.add_field(
+        embed.set_field_at(
+            4,
             name="⏳ Timer",
-            value=f"{timer_icon} **{minutes}:{seconds:02d}** remaining",
+            value=f"⏰ Expires <t:{expiry}:R>",
             inline=False
         )
         
+        embed.set_footer(
+            text=f"🎯 Current turn: {current_player.name}",
+            icon_url=current_player.avatar_url
+        )
+        return embed
+    
+    @staticmethod
+    def _build_game_embed(game_state: GameState) -> discord.Embed:
+        """Build the parts of the public game embed that don't change during a game"""
+        p1, p2 = game_state.player1, game_state.player2
+        
+        embed = discord.Embed(
+            title="🎲 Twenty One Battle",
+            description=f"⚔️ {p1.mention} **VS** {p2.mention}",
+            color=_COLOR_GOLD
+        )
+        
+        # Placeholders for cards (0, 1), status (3) and timer (4), see create_game_embed
+        embed.add_field(name="\u200b", value="\u200b", inline=True)
+        embed.add_field(name="\u200b", value="\u200b", inline=True)
+        embed.add_field(name="\u200b", value="\u200b", inline=True)
+        embed.add_field(name="\u200b", value="\u200b", inline=False)
+        embed.add_field(name="\u200b", value="\u200b", inline=False)
+        
         embed.add_field(
             name="💡 How to Play",
             value="🃏 **Click 'View Cards' button** to see your hand\n"
@@ -366,11 +592,6 @@ class EmbedCreator:
                   "🎯 First card stays hidden, additional cards are visible",
             inline=False
         )
-        
-        embed.set_footer(
-            text=f"🎯 Current turn: {current_player.user.display_name}",
-            icon_url=current_player.user.display_avatar.url
-        )
         return embed
     
     @staticmethod
@@ -383,7 +604,7 @@ class EmbedCreator:
         """Create endgame results embed"""
         p1, p2 = game_state.player1, game_state.player2
         
-        embed = discord.Embed(title="🏁 Game Over!", color=discord.Color.gold())
+        embed = discord.Embed(title="🏁 Game Over!", color=_COLOR_GOLD)
         
         # Set description based on end reason
         if reason == GameEndReason.BUST:
@@ -394,9 +615,9 @@ class EmbedCreator:
             embed.description = "🃏 Deck is empty! Game ends in a draw."
         else:  # REVEAL
             if p1.score > p2.score:
-                embed.description = f"🎉 **{p1.user.mention}** wins with {p1.score}!"
+                embed.description = f"🎉 **{p1.mention}** wins with {p1.score}!"
             elif p2.score > p1.score:
-                embed.description = f"🎉 **{p2.user.mention}** wins with {p2.score}!"
+                embed.description = f"🎉 **{p2.mention}** wins with {p2.score}!"
             else:
                 embed.description = "🤝 **It's a tie!** Both players have the same score."
         
@@ -404,17 +625,14 @@ class EmbedCreator:
         def get_status_text(player_data: PlayerData) -> str:
             return "💥 BUST" if player_data.is_bust else f"✅ {player_data.total}"
         
-        def get_cards_text(player_data: PlayerData) -> str:
-            return " • ".join([f"**{card}**" for card in player_data.cards])
-        
         embed.add_field(
-            name=f"🎴 {p1.user.display_name}'s Final Hand",
-            value=f"{get_cards_text(p1)}\n**Total: {get_status_text(p1)}**",
+            name=f"🎴 {p1.name}'s Final Hand",
+            value=f"{p1.cards_text}\n**Total: {get_status_text(p1)}**",
             inline=False
         )
         embed.add_field(
-            name=f"🎴 {p2.user.display_name}'s Final Hand",
-            value=f"{get_cards_text(p2)}\n**Total: {get_status_text(p2)}**",
+            name=f"🎴 {p2.name}'s Final Hand",
+            value=f"{p2.cards_text}\n**Total: {get_status_text(p2)}**",
             inline=False
         )
         
@@ -422,18 +640,27 @@ class EmbedCreator:
     
     @staticmethod
     def create_profile_embed(user: discord.Member, user_stats: Dict[str, int]) -> discord.Embed:
-        """Create profile statistics embed"""
+        """Create profile statistics embed (shared between calls, don't mutate it)"""
+        return EmbedCreator._build_profile_embed(
+            user.display_name,
+            user.display_avatar.url,
+            user_stats.get('wins', 0),
+            user_stats.get('losses', 0)
+        )
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _build_profile_embed(display_name: str, avatar_url: str, wins: int, losses: int) -> discord.Embed:
+        """Build profile embed, cached on everything it displays"""
         embed = discord.Embed(
-            title=f"📊 Game Profile - {user.display_name}",
-            color=discord.Color.purple()
+            title=f"📊 Game Profile - {display_name}",
+            color=_COLOR_PURPLE
         )
-        embed.set_thumbnail(url=user.display_avatar.url)
+        embed.set_thumbnail(url=avatar_url)
         
-        if not any(user_stats.values()):
+        if not (wins or losses):
             embed.description = "This player hasn't played any games yet."
         else:
-            wins = user_stats.get('wins', 0)
-            losses = user_stats.get('losses', 0)
             total_games = wins + losses
             win_rate = (wins / total_games * 100) if total_games > 0 else 0
             
@@ -447,11 +674,10 @@ class EmbedCreator:
 # ==================== UI COMPONENTS ====================
 
 class GameView(discord.ui.View):
-    """Enhanced view with better error handling"""
+    """Persistent view for game messages, looked up by message ID"""
     
-    def __init__(self, game_key: frozenset):
+    def __init__(self):
         super().__init__(timeout=None)
-        self.game_key = game_key
     
     @discord.ui.button(label="🃏 View Cards", style=discord.ButtonStyle.primary, custom_id="view_cards")
     async def view_cards(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -460,14 +686,14 @@ class GameView(discord.ui.View):
             player_id = interaction.user.id
             
             # Validate game exists
-            if self.game_key not in active_games:
+            game_state = message_to_game.get(interaction.message.id)
+            if not game_state:
                 await interaction.response.send_message(
                     "❌ This game is no longer active!", 
                     ephemeral=True
                 )
                 return
             
-            game_state = active_games[self.game_key]
             player_data = game_state.get_player_data(player_id)
             
             # Validate player
@@ -482,16 +708,16 @@ class GameView(discord.ui.View):
             embed = EmbedCreator.create_private_hand_embed(player_data)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
-            logger.info(f"View Cards used by {interaction.user}")
+            logger.info("View Cards used by %s", interaction.user)
             
         except Exception as e:
-            logger.error(f"View cards error: {e}")
+            logger.error("View cards error: %s", e)
             try:
                 await interaction.response.send_message(
                     "❌ Error viewing cards. Try again.", 
                     ephemeral=True
                 )
-            except:
+            except discord.HTTPException:
                 pass
 
 # ==================== GAME MANAGEMENT ====================
@@ -500,7 +726,7 @@ class GameManager:
     """Centralized game management with better resource handling"""
     
     @staticmethod
-    async def update_public_embed(game_key: frozenset) -> None:
+    async def update_public_embed(game_key: GameKey) -> None:
         """Update the public game embed"""
         if game_key not in active_games:
             return
@@ -509,28 +735,61 @@ class GameManager:
         if not game_state.public_message:
             return
         
+        # Skip the HTTP edit when nothing visible has changed
+        signature = game_state.public_signature()
+        if signature == game_state.last_public_signature:
+            return
+        
         try:
             embed = EmbedCreator.create_game_embed(game_state)
-            view = GameView(game_key)
-            await game_state.public_message.edit(embed=embed, view=view)
+            # The message keeps its View Cards button, no need to resend it
+            await game_state.public_message.edit(embed=embed)
+            game_state.last_public_signature = signature
         except discord.NotFound:
-            logger.warning(f"Public message not found for game {game_key}")
+            logger.warning("Public message not found for game %s", game_key)
         except Exception as e:
-            logger.error(f"Error updating public embed: {e}")
+            logger.error("Error updating public embed: %s", e)
+    
+    @staticmethod
+    def schedule_public_update(game_key: GameKey) -> None:
+        """Queue a public embed update, merging requests made in the same tick"""
+        game_state = active_games.get(game_key)
+        if not game_state or game_state.public_update_pending:
+            return
+        game_state.public_update_pending = True
+        
+        async def flush():
+            await asyncio.sleep(0)  # Let the current handler finish mutating state
+            game_state.public_update_pending = False
+            await GameManager.update_public_embed(game_key)
+        
+        game_state.spawn(flush())
+    
+    @staticmethod
+    def unregister_game(game_key: GameKey) -> Optional[GameState]:
+        """Remove game from storage and lookup indexes, returning it if it was active"""
+        game_state = active_games.pop(game_key, None)
+        if game_state is None:
+            return None
+        player_to_game.pop(game_state.p1_id, None)
+        player_to_game.pop(game_state.p2_id, None)
+        if game_state.public_message:
+            message_to_game.pop(game_state.public_message.id, None)
+        return game_state
     
     @staticmethod
     async def end_game(
-        game_key: frozenset, 
+        game_key: GameKey, 
         reason: GameEndReason, 
         winner: Optional[discord.Member] = None, 
         timed_out_player: Optional[discord.Member] = None
     ) -> None:
         """End game with proper cleanup and stats update"""
-        if game_key not in active_games:
+        # Pop first so concurrent callers can't both finalize the game
+        game_state = GameManager.unregister_game(game_key)
+        if game_state is None:
             return
         
-        game_state = active_games.pop(game_key)
-        
         # Determine final winner/loser for stats
         final_winner, final_loser = None, None
         
@@ -548,13 +807,12 @@ class GameManager:
             elif p2_score > p1_score:
                 final_winner, final_loser = game_state.player2.user, game_state.player1.user
         
-        # Update stats
+        # Update stats (written to disk by the autosave task)
         if final_winner and final_loser:
             stats_manager.update_game_result(final_winner.id, final_loser.id)
-            stats_manager.save_stats()
         
         # Cleanup resources
-        game_state.cleanup()
+        await game_state.cleanup()
         
         # Update message
         if game_state.public_message:
@@ -564,92 +822,116 @@ class GameManager:
                 )
                 await game_state.public_message.edit(embed=embed, view=None)
             except discord.NotFound:
-                logger.warning(f"Public message not found for ended game")
+                logger.warning("Public message not found for ended game")
             except Exception as e:
-                logger.error(f"Error updating endgame embed: {e}")
+                logger.error("Error updating endgame embed: %s", e)
     
     @staticmethod
-    async def create_timer_task(game_key: frozenset) -> asyncio.Task:
-        """Create AFK timer task"""
-        async def timer_task():
-            try:
-                await asyncio.sleep(config.GAME_TIMEOUT)
-                if game_key in active_games:
-                    game_state = active_games[game_key]
-                    current_player = game_state.get_current_player()
-                    opponent = game_state.get_opponent_data(current_player.user.id)
-                    
-                    await GameManager.end_game(
-                        game_key, 
-                        GameEndReason.TIMEOUT, 
-                        winner=opponent.user, 
-                        timed_out_player=current_player.user
-                    )
-                    logger.info(f"Game {game_key} ended due to timeout")
-            except asyncio.CancelledError:
-                pass
+    def schedule_timeout(game_key: GameKey) -> None:
+        """Arm the AFK timeout for a game"""
+        game_state = active_games.get(game_key)
+        if not game_state:
+            return
+        
+        # Weak reference so a pending timer never keeps a finished game alive
+        game_ref = weakref.ref(game_state)
         
-        return asyncio.create_task(timer_task())
+        def on_timeout():
+            game_state = game_ref()
+            if game_state:
+                game_state.spawn(GameManager._on_timeout(game_key))
+        
+        game_state.set_timeout_callback(on_timeout)
     
     @staticmethod
-    async def create_display_updater_task(game_key: frozenset) -> asyncio.Task:
-        """Create display updater task"""
-        async def updater_task():
-            try:
-                while game_key in active_games:
-                    await asyncio.sleep(5)  # Update every 5 seconds
-                    if game_key in active_games:
-                        await GameManager.update_public_embed(game_key)
-            except asyncio.CancelledError:
-                pass
+    async def _on_timeout(game_key: GameKey) -> None:
+        """End game in favour of the opponent when a turn runs out"""
+        game_state = active_games.get(game_key)
+        if not game_state:
+            return
         
-        return asyncio.create_task(updater_task())
+        current_player = game_state.current_player
+        opponent = game_state.opponent
+        
+        await GameManager.end_game(
+            game_key, 
+            GameEndReason.TIMEOUT, 
+            winner=opponent.user, 
+            timed_out_player=current_player.user
+        )
+        logger.info("Game %s ended due to timeout", game_key)
 
 # ==================== BOT SETUP ====================
 
 # Bot configuration
 intents = discord.Intents.default()
 intents.members = True
-intents.message_content = True
+intents.message_content = config.ENABLE_PREFIX_COMMANDS  # Only prefix commands read messages
 bot = commands.Bot(command_prefix=config.BOT_PREFIX, intents=intents, help_command=None)
 
 # ==================== BOT EVENTS ====================
 
 @bot.event
-async def on_ready():
-    """Bot ready event with improved logging"""
-    logger.info(f'Bot logged in as {bot.user} (ID: {bot.user.id})')
+async def setup_hook():
+    """Start background jobs once the event loop is running"""
+    # Keeps board buttons working after a restart; live games get their own view
+    bot.add_view(GameView())
     
-    # Sync commands
+    stats_manager.start_autosave(config.STATS_SAVE_INTERVAL)
+
+# In-flight tree sync, shared by concurrent callers
+_sync_task: Optional[asyncio.Task] = None
+
+async def sync_tree() -> list:
+    """Sync the command tree, joining a sync that is already running"""
+    global _sync_task
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.create_task(bot.tree.sync())
+    # Shield so one cancelled caller doesn't abort the sync for the others
+    return await asyncio.shield(_sync_task)
+
+async def sync_commands() -> None:
+    """Sync slash commands with Discord"""
     try:
         logger.info("Syncing slash commands...")
-        synced = await bot.tree.sync()
-        logger.info(f"Successfully synced {len(synced)} command(s)")
+        synced = await sync_tree()
+        logger.info("Successfully synced %d command(s)", len(synced))
         
         # Debug output
-        print("=== Synced Commands ===")
-        for cmd in synced:
-            print(f"  ✓ /{cmd.name}: {cmd.description}")
-        print("=====================")
+        if logger.isEnabledFor(logging.DEBUG):
+            for cmd in synced:
+                logger.debug("Synced /%s: %s", cmd.name, cmd.description)
         
     except Exception as e:
-        logger.error(f"Failed to sync commands: {e}")
+        logger.error("Failed to sync commands: %s", e)
+
+async def send_startup_message() -> None:
+    """Send startup help message to the configured channel"""
+    if not config.CHANNEL_ID:
+        return
     
-    # Send startup message
-    if config.CHANNEL_ID:
-        try:
-            channel = bot.get_channel(config.CHANNEL_ID)
-            if channel:
-                embed = EmbedCreator.create_help_embed()
-                embed.add_field(
-                    name="🚀 Bot Status", 
-                    value="Bot is online and slash commands are ready!\nType `/` to see available commands.", 
-                    inline=False
-                )
-                await channel.send(embed=embed)
-                logger.info(f"Startup message sent to #{channel.name}")
-        except Exception as e:
-            logger.error(f"Failed to send startup message: {e}")
+    try:
+        channel = bot.get_channel(config.CHANNEL_ID)
+        if channel:
+            embed = EmbedCreator.create_help_embed()
+            embed.add_field(
+                name="🚀 Bot Status", 
+                value="Bot is online and slash commands are ready!\nType `/` to see available commands.", 
+                inline=False
+            )
+            await channel.send(embed=embed)
+            logger.info("Startup message sent to #%s", channel.name)
+    except Exception as e:
+        logger.error("Failed to send startup message: %s", e)
+
+@bot.event
+async def on_ready():
+    """Bot ready event with improved logging"""
+    logger.info("Bot logged in as %s (ID: %s)", bot.user, bot.user.id)
+    
+    # Announce only after the sync, the message tells users commands are ready
+    await sync_commands()
+    await send_startup_message()
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -663,214 +945,208 @@ async def on_command_error(ctx, error):
     elif isinstance(error, commands.BotMissingPermissions):
         await ctx.send("❌ I don't have the required permissions to run this command.")
     else:
-        logger.error(f"Unexpected command error: {error}")
+        logger.error("Unexpected command error: %s", error)
         await ctx.send("❌ An unexpected error occurred. Please try again.")
 
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    """Single fallback for unexpected slash command errors"""
+    original = getattr(error, 'original', error)
+    command_name = interaction.command.qualified_name if interaction.command else "unknown"
+    await handle_command_error(interaction, original, command_name)
+
 # ==================== SLASH COMMANDS ====================
 
 @bot.tree.command(name="help", description="Show bot help and commands")
 async def help_slash(interaction: discord.Interaction):
     """Help command"""
-    try:
-        logger.info(f"Help command used by {interaction.user}")
-        embed = EmbedCreator.create_help_embed()
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        await handle_command_error(interaction, e, "help_slash")
+    logger.info("Help command used by %s", interaction.user)
+    await interaction.response.send_message(embed=EmbedCreator.get_help_embed())
 
 @bot.tree.command(name="play", description="Start a new Twenty One game")
 async def play_slash(interaction: discord.Interaction, opponent: discord.Member):
     """Start new game command"""
-    try:
-        logger.info(f"Play command: {interaction.user} vs {opponent}")
-        
-        player1, player2 = interaction.user, opponent
-        
-        # Validation
-        if player1.bot or player2.bot:
-            await interaction.response.send_message("❌ Cannot play against bots!", ephemeral=True)
-            return
-        if player1 == player2:
-            await interaction.response.send_message("❌ You cannot challenge yourself!", ephemeral=True)
-            return
-        
-        game_key = frozenset({player1.id, player2.id})
-        if game_key in active_games:
-            await interaction.response.send_message(
-                "❌ A game between these players is already in progress!", 
-                ephemeral=True
-            )
-            return
-        
-        # Create game
-        game_state = GameState(player1, player2, interaction.channel)
-        active_games[game_key] = game_state
-        
-        await interaction.response.send_message("🎲 Setting up the game...")
-        game_state.public_message = await interaction.original_response()
-        
-        # Create and track tasks
-        timer_task = await GameManager.create_timer_task(game_key)
-        updater_task = await GameManager.create_display_updater_task(game_key)
-        game_state.add_task(timer_task)
-        game_state.add_task(updater_task)
-        
-        await GameManager.update_public_embed(game_key)
-        
-        # Send initial hands
-        p1_embed = EmbedCreator.create_private_hand_embed(game_state.player1)
-        await interaction.followup.send(embed=p1_embed, ephemeral=True)
-        
-        await interaction.followup.send(
-            f"{player2.mention}, click the **🃏 View Cards** button to see your starting hand!",
+    logger.info("Play command: %s vs %s", interaction.user, opponent)
+    
+    player1, player2 = interaction.user, opponent
+    
+    # Validation
+    if player1.bot or player2.bot:
+        await interaction.response.send_message("❌ Cannot play against bots!", ephemeral=True)
+        return
+    if player1 == player2:
+        await interaction.response.send_message("❌ You cannot challenge yourself!", ephemeral=True)
+        return
+    
+    if player1.id in player_to_game or player2.id in player_to_game:
+        await interaction.response.send_message(
+            "❌ One of these players is already in an active game!", 
             ephemeral=True
         )
-        
-        logger.info(f"Game started between {player1} and {player2}")
-    except Exception as e:
-        await handle_command_error(interaction, e, "play_slash")
+        return
+    
+    # Create game
+    game_state = GameState(player1, player2, interaction.channel)
+    game_key = game_state.key
+    active_games[game_key] = game_state
+    player_to_game[player1.id] = game_state
+    player_to_game[player2.id] = game_state
+    
+    try:
+        # Acknowledge right away so setup isn't racing the interaction deadline
+        await interaction.response.defer()
+        
+        # Send the real board as the followup, getting the message back directly
+        embed = EmbedCreator.create_game_embed(game_state)
+        game_state.last_public_signature = game_state.public_signature()
+        game_state.view = GameView()
+        game_state.public_message = await interaction.followup.send(
+            embed=embed, view=game_state.view, wait=True
+        )
+        message_to_game[game_state.public_message.id] = game_state
+        
+        # Start AFK timer
+        GameManager.schedule_timeout(game_key)
+    except BaseException:
+        # Setup never finished; unregister so neither player is locked out
+        abandoned = GameManager.unregister_game(game_key)
+        if abandoned:
+            await abandoned.cleanup()
+        raise
+    
+    # Send challenger's hand; the opponent uses the board's View Cards button
+    p1_embed = EmbedCreator.create_private_hand_embed(game_state.player1)
+    await interaction.followup.send(embed=p1_embed, ephemeral=True)
+    
+    logger.info("Game started between %s and %s", player1, player2)
 
 @bot.tree.command(name="drink", description="Take another card")
 async def drink_slash(interaction: discord.Interaction):
     """Take card command"""
-    try:
-        logger.info(f"Drink command used by {interaction.user}")
-        
-        player_id = interaction.user.id
-        game_key = next((key for key in active_games if player_id in key), None)
-        
-        if not game_key:
-            await interaction.response.send_message("❌ You're not in an active game!", ephemeral=True)
-            return
-        
-        game_state = active_games[game_key]
-        
-        # Validation
-        if player_id != game_state.current_turn_id:
-            await interaction.response.send_message("❌ It's not your turn!", ephemeral=True)
-            return
-        
-        player_data = game_state.get_player_data(player_id)
-        if player_data.continued:
-            await interaction.response.send_message(
-                "❌ You already chose to continue! Cannot take more cards.", 
-                ephemeral=True
-            )
-            return
-        
-        if not game_state.deck:
+    logger.info("Drink command used by %s", interaction.user)
+    
+    player_id = interaction.user.id
+    game = get_game_by_player(player_id)
+    
+    if not game:
+        await interaction.response.send_message("❌ You're not in an active game!", ephemeral=True)
+        return
+    
+    game_key, game_state = game
+    
+    # Validation
+    if player_id != game_state.current_turn_id:
+        await interaction.response.send_message("❌ It's not your turn!", ephemeral=True)
+        return
+    
+    player_data = game_state.get_player_data(player_id)
+    if player_data.continued:
+        await interaction.response.send_message(
+            "❌ You already chose to continue! Cannot take more cards.", 
+            ephemeral=True
+        )
+        return
+    
+    if game_state.deck_empty:
+        try:
             await interaction.response.send_message("❌ The deck is empty!", ephemeral=True)
-            await GameManager.end_game(game_key, GameEndReason.DECK_EMPTY)
-            return
-        
-        # Cancel current tasks
-        game_state.cleanup()
-        
-        # Deal card
-        new_card = game_state.deck.pop()
-        player_data.cards.append(new_card)
-        
-        # IMPORTANT: Reset timer for same player after drinking
-        game_state.reset_turn_timer()
-        
-        # Send updated hand
-        embed = EmbedCreator.create_private_hand_embed(player_data)
+        except discord.HTTPException as e:
+            logger.warning("Could not send deck empty notice to %s: %s", interaction.user, e)
+        await GameManager.end_game(game_key, GameEndReason.DECK_EMPTY)
+        return
+    
+    # Deal card
+    new_card = game_state.draw_card()
+    player_data.add_card(new_card)
+    
+    # IMPORTANT: Reset timer for same player after drinking
+    game_state.reset_turn_timer()
+    
+    # Update display in the background so the private reply isn't held up
+    if not player_data.is_bust:
+        GameManager.schedule_public_update(game_key)
+    
+    # Send updated hand; a failed reply must not skip the bust check
+    embed = EmbedCreator.create_private_hand_embed(player_data)
+    try:
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        # Check for bust
-        if player_data.is_bust:
-            opponent_data = game_state.get_opponent_data(player_id)
-            await GameManager.end_game(game_key, GameEndReason.BUST, winner=opponent_data.user)
-            logger.info(f"{interaction.user} went bust with {player_data.total}")
-        else:
-            # Create new tasks with fresh timer
-            timer_task = await GameManager.create_timer_task(game_key)
-            updater_task = await GameManager.create_display_updater_task(game_key)
-            game_state.add_task(timer_task)
-            game_state.add_task(updater_task)
-            
-            # Update display immediately to show fresh timer
-            await GameManager.update_public_embed(game_key)
-    except Exception as e:
-        await handle_command_error(interaction, e, "drink_slash")
+    except discord.HTTPException as e:
+        logger.warning("Could not send hand to %s: %s", interaction.user, e)
+    
+    # Check for bust
+    if player_data.is_bust:
+        await GameManager.end_game(game_key, GameEndReason.BUST, winner=game_state.opponent.user)
+        logger.info("%s went bust with %s", interaction.user, player_data.total)
 
 @bot.tree.command(name="continue", description="Keep current cards and end your turn")
 async def continue_slash(interaction: discord.Interaction):
     """Continue with current cards command"""
+    logger.info("Continue command used by %s", interaction.user)
+    
+    # Acknowledge first; everything below replies through followups
+    await interaction.response.defer(ephemeral=True)
+    
+    player_id = interaction.user.id
+    game = get_game_by_player(player_id)
+    
+    if not game:
+        await interaction.followup.send("❌ You're not in an active game!", ephemeral=True)
+        return
+    
+    game_key, game_state = game
+    
+    # Validation
+    if player_id != game_state.current_turn_id:
+        await interaction.followup.send("❌ It's not your turn!", ephemeral=True)
+        return
+    
+    player_data = game_state.get_player_data(player_id)
+    if player_data.continued:
+        await interaction.followup.send("❌ You already chose to continue!", ephemeral=True)
+        return
+    
+    # Hold off the AFK timer while we respond
+    game_state.reset_turn_timer()
+    
+    # Set continued status
+    player_data.continued = True
     try:
-        logger.info(f"Continue command used by {interaction.user}")
-        
-        player_id = interaction.user.id
-        game_key = next((key for key in active_games if player_id in key), None)
-        
-        if not game_key:
-            await interaction.response.send_message("❌ You're not in an active game!", ephemeral=True)
-            return
-        
-        game_state = active_games[game_key]
-        
-        # Validation
-        if player_id != game_state.current_turn_id:
-            await interaction.response.send_message("❌ It's not your turn!", ephemeral=True)
-            return
-        
-        player_data = game_state.get_player_data(player_id)
-        if player_data.continued:
-            await interaction.response.send_message("❌ You already chose to continue!", ephemeral=True)
-            return
-        
-        # Cancel current tasks
-        game_state.cleanup()
-        
-        # Set continued status
-        player_data.continued = True
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "✅ You chose to continue with your current cards. Turn passes to opponent.", 
             ephemeral=True
         )
+    except discord.HTTPException as e:
+        # The choice is already recorded, so the turn has to move on regardless
+        logger.warning("Could not confirm continue to %s: %s", interaction.user, e)
+    
+    # Check if both players continued
+    if game_state.both_continued:
+        await GameManager.end_game(game_key, GameEndReason.REVEAL)
+        logger.info("Game %s ended - both players continued", game_key)
+    else:
+        # Switch turn (this will reset timer automatically)
+        game_state.switch_turn()
         
-        # Check if both players continued
-        if game_state.both_continued:
-            await GameManager.end_game(game_key, GameEndReason.REVEAL)
-            logger.info(f"Game {game_key} ended - both players continued")
-        else:
-            # Switch turn (this will reset timer automatically)
-            game_state.switch_turn()
-            
-            # Create new tasks with fresh timer
-            timer_task = await GameManager.create_timer_task(game_key)
-            updater_task = await GameManager.create_display_updater_task(game_key)
-            game_state.add_task(timer_task)
-            game_state.add_task(updater_task)
-            
-            # Update display immediately to show fresh timer
-            await GameManager.update_public_embed(game_key)
-    except Exception as e:
-        await handle_command_error(interaction, e, "continue_slash")
+        # Update display to show fresh timer
+        GameManager.schedule_public_update(game_key)
 
 @bot.tree.command(name="profil", description="View player's game statistics")
 async def profile_slash(interaction: discord.Interaction, user: discord.Member):
     """View profile statistics command"""
-    try:
-        logger.info(f"Profile command used by {interaction.user} for {user.display_name}")
-        
-        user_stats = stats_manager.get_user_stats(user.id)
-        embed = EmbedCreator.create_profile_embed(user, user_stats)
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        await handle_command_error(interaction, e, "profile_slash")
+    logger.info("Profile command used by %s for %s", interaction.user, user.display_name)
+    
+    user_stats = stats_manager.get_user_stats(user.id)
+    embed = EmbedCreator.create_profile_embed(user, user_stats)
+    await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="stats", description="View your game statistics")
 async def stats_slash(interaction: discord.Interaction):
     """View own statistics command"""
-    try:
-        logger.info(f"Stats command used by {interaction.user}")
-        
-        user_stats = stats_manager.get_user_stats(interaction.user.id)
-        embed = EmbedCreator.create_profile_embed(interaction.user, user_stats)
-        await interaction.response.send_message(embed=embed)
-    except Exception as e:
-        await handle_command_error(interaction, e, "stats_slash")
+    logger.info("Stats command used by %s", interaction.user)
+    
+    user_stats = stats_manager.get_user_stats(interaction.user.id)
+    embed = EmbedCreator.create_profile_embed(interaction.user, user_stats)
+    await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="sync", description="Manually sync slash commands (owner only)")
 async def sync_slash(interaction: discord.Interaction):
@@ -884,42 +1160,47 @@ async def sync_slash(interaction: discord.Interaction):
             return
         
         await interaction.response.defer(ephemeral=True)
-        synced = await bot.tree.sync()
+        synced = await sync_tree()
         await interaction.followup.send(
             f"✅ Successfully synced {len(synced)} command(s)!", 
             ephemeral=True
         )
-        logger.info(f"Manual sync completed: {len(synced)} commands")
+        logger.info("Manual sync completed: %s commands", len(synced))
     except Exception as e:
         try:
             await interaction.followup.send(f"❌ Sync failed: {e}", ephemeral=True)
-        except:
+        except discord.HTTPException:
             pass
-        logger.error(f"Sync error: {e}")
+        logger.error("Sync error: %s", e)
 
 # ==================== LEGACY PREFIX COMMANDS ====================
 
-@bot.command(name='help', aliases=['menu'])
+@commands.command(name='help', aliases=['menu'])
 async def help_prefix(ctx):
     """Legacy prefix help command"""
-    embed = EmbedCreator.create_help_embed()
-    await ctx.send(embed=embed)
+    await ctx.send(embed=EmbedCreator.get_help_embed())
+
+# Slash commands cover everything; prefix commands are opt-in
+if config.ENABLE_PREFIX_COMMANDS:
+    bot.add_command(help_prefix)
 
 # ==================== UTILITY FUNCTIONS ====================
 
-def get_game_by_player(player_id: int) -> Optional[Tuple[frozenset, GameState]]:
+def get_game_by_player(player_id: int) -> Optional[Tuple[GameKey, GameState]]:
     """Get game containing specific player"""
-    for game_key, game_state in active_games.items():
-        if player_id in game_key:
-            return game_key, game_state
-    return None
+    game_state = player_to_game.get(player_id)
+    return (game_state.key, game_state) if game_state else None
 
 async def cleanup_all_games():
     """Clean up all active games on shutdown"""
     logger.info("Cleaning up all active games...")
-    for game_state in active_games.values():
-        game_state.cleanup()
+    await asyncio.gather(
+        *(game_state.cleanup() for game_state in list(active_games.values())),
+        return_exceptions=True
+    )
     active_games.clear()
+    player_to_game.clear()
+    message_to_game.clear()
     
     # Save final stats
     stats_manager.save_stats()
@@ -927,30 +1208,32 @@ async def cleanup_all_games():
 
 # ==================== MAIN EXECUTION ====================
 
-def validate_environment() -> bool:
-    """Validate required environment variables"""
+def validate_environment() -> Optional[str]:
+    """Validate required environment variables and return the bot token"""
     token = os.getenv('DISCORD_TOKEN')
     if not token:
         logger.error("DISCORD_TOKEN not found in environment variables!")
         logger.error("Create a .env file with: DISCORD_TOKEN=your_bot_token_here")
-        return False
-    return True
+        return None
+    return token
 
 def main():
     """Main bot execution function"""
     try:
-        if not validate_environment():
+        token = validate_environment()
+        if not token:
             return
         
         logger.info("Starting Twenty One Bot...")
-        logger.info(f"Configuration: Timeout={config.GAME_TIMEOUT}s, Max Card={config.MAX_CARD_VALUE}")
+        logger.info(
+            "Configuration: Timeout=%ss, Max Card=%s", config.GAME_TIMEOUT, config.MAX_CARD_VALUE
+        )
         
         # Register cleanup on bot close
         @bot.event
         async def on_close():
             await cleanup_all_games()
         
-        token = os.getenv('DISCORD_TOKEN')
         bot.run(token)
         
     except discord.LoginFailure:
@@ -959,9 +1242,10 @@ def main():
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Error running bot: {e}")
+        logger.error("Error running bot: %s", e)
     finally:
         # Final cleanup
+        stats_manager.save_stats()
         logger.info("Bot shutdown complete")
 
 if __name__ == "__main__":